@@ -1,27 +1,22 @@
+import asyncio
+import os
+import re
 from datetime import datetime
 
-from langchain_ollama import ChatOllama
+import numpy as np
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import PydanticOutputParser
 
+import llm_cache
+from clients import resume_llm as llm
+from parsers import FastJsonParser
 from schemas import CandidateProfile
 
 
-# ------------------------------------------------------------------
-# LLM INITIALIZATION (DETERMINISTIC)
-# ------------------------------------------------------------------
-
-llm = ChatOllama(
-    model="llama3",
-    temperature=0
-)
-
-
 # ------------------------------------------------------------------
 # OUTPUT PARSER (STRUCTURED CONTRACT)
 # ------------------------------------------------------------------
 
-parser = PydanticOutputParser(pydantic_object=CandidateProfile)
+parser = FastJsonParser(pydantic_object=CandidateProfile)
 
 
 # ------------------------------------------------------------------
@@ -69,22 +64,133 @@ Resume:
 
 chain = prompt | llm | parser
 
+# Part of the extraction cache key: editing the prompt template
+# invalidates every cached profile extracted with the old wording.
+_PROMPT_VERSION = prompt.messages[0].prompt.template
+
+
+# ------------------------------------------------------------------
+# RESUME PRECOMPRESSION
+#
+# Prefill cost grows quadratically with prompt length and KV memory
+# linearly, so boilerplate the extractor never needs is stripped
+# before the LLM sees the resume. Contact lines are deliberately
+# kept: email is an extracted field.
+# ------------------------------------------------------------------
+
+RESUME_CHAR_BUDGET = int(os.environ.get("RESUME_CHAR_BUDGET", "6000"))
+
+_BULLET_RE = re.compile(r"^[ \t]*[•▪●◦‣*\-]+[ \t]*", re.MULTILINE)
+_BLANK_RUN_RE = re.compile(r"\n{3,}")
+_BOILERPLATE_RE = re.compile(
+    r"^.*references\s+(are\s+)?available.*$",
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+def _precompress_resume(text: str) -> str:
+    """
+    Shrink a resume before it reaches the prompt: drop boilerplate
+    lines, bullet symbols and blank-line runs, then cap at
+    RESUME_CHAR_BUDGET characters. Content the schema extracts from
+    (names, dates, skills, email) survives untouched.
+    """
+    text = _BOILERPLATE_RE.sub("", text)
+    text = _BULLET_RE.sub("", text)
+    text = _BLANK_RUN_RE.sub("\n\n", text)
+    return text.strip()[:RESUME_CHAR_BUDGET]
+
+
+# ------------------------------------------------------------------
+# CONCURRENCY CONTROL
+#
+# Extractions run concurrently against Ollama. The server handles at
+# most OLLAMA_NUM_PARALLEL requests per loaded model (Ollama env var,
+# default 4), so we cap in-flight requests with a semaphore to avoid
+# queueing on the server side. Raise OLLAMA_NUM_PARALLEL (and
+# OLLAMA_MAX_LOADED_MODELS if running multiple models) on the Ollama
+# server to scale up.
+# ------------------------------------------------------------------
+
+OLLAMA_NUM_PARALLEL = int(os.environ.get("OLLAMA_NUM_PARALLEL", "4"))
+
+_extraction_semaphore = asyncio.Semaphore(OLLAMA_NUM_PARALLEL)
+
 
 # ------------------------------------------------------------------
 # AGENT INTERFACE (EXPLICIT CONTRACT)
 # ------------------------------------------------------------------
 
-def extract_candidate_profile(resume_text: str) -> CandidateProfile:
+async def extract_candidate_profile(resume_text: str) -> CandidateProfile:
     """
     Agent responsibility:
     - Convert unstructured resume text into structured CandidateProfile
     - Enforce schema validity
     - No business logic, no scoring, no reasoning
+
+    Runs asynchronously so multiple resumes can be extracted in
+    parallel, bounded by OLLAMA_NUM_PARALLEL. Results are served from
+    the content-addressed disk cache when the resume, model and prompt
+    are all unchanged.
+    """
+    resume_text = _precompress_resume(resume_text)
+
+    key = llm_cache.cache_key(resume_text, llm.model, _PROMPT_VERSION)
+    cached = llm_cache.load(key, CandidateProfile)
+    if cached is not None:
+        return cached
+
+    async with _extraction_semaphore:
+        profile = await chain.ainvoke({
+            "resume_text": resume_text,
+            "format_instructions": parser.get_format_instructions()
+        })
+
+    llm_cache.store(key, profile)
+    return profile
+
+
+async def extract_candidate_profiles(resume_texts: list[str]) -> list[CandidateProfile]:
+    """
+    Batched variant of extract_candidate_profile.
+
+    Packages every resume into a single abatch call over one persistent
+    client connection (HTTP keep-alive), instead of N independent
+    request/response cycles. LangChain fans the payloads out
+    concurrently, bounded by max_concurrency, so prompt-prefix
+    processing and HTTP overhead are amortized across the batch.
+
+    Cached resumes are answered from disk; only the misses go to the
+    LLM, as one batch.
     """
-    return chain.invoke({
-        "resume_text": resume_text,
-        "format_instructions": parser.get_format_instructions()
-    })
+    resume_texts = [_precompress_resume(text) for text in resume_texts]
+    keys = [
+        llm_cache.cache_key(resume_text, llm.model, _PROMPT_VERSION)
+        for resume_text in resume_texts
+    ]
+    profiles: list[CandidateProfile | None] = [
+        llm_cache.load(key, CandidateProfile) for key in keys
+    ]
+
+    misses = [i for i, profile in enumerate(profiles) if profile is None]
+    if misses:
+        format_instructions = parser.get_format_instructions()
+        payloads = [
+            {
+                "resume_text": resume_texts[i],
+                "format_instructions": format_instructions,
+            }
+            for i in misses
+        ]
+        fresh = await chain.abatch(
+            payloads,
+            config={"max_concurrency": OLLAMA_NUM_PARALLEL},
+        )
+        for i, profile in zip(misses, fresh):
+            llm_cache.store(keys[i], profile)
+            profiles[i] = profile
+
+    return profiles
 
 
 def extract_job_requirements(job_text: str):
@@ -99,17 +205,48 @@ def extract_job_requirements(job_text: str):
 # DETERMINISTIC POST-PROCESSING (NON-LLM LOGIC)
 # ------------------------------------------------------------------
 
+def _parse_roles_to_array(roles: list[list[str]]) -> np.ndarray:
+    """
+    Convert extracted role date ranges to a (n, 2) int32 array,
+    resolving "Present" to the current year. Parsing happens once so
+    the arithmetic can run as array ops instead of an interpreter loop.
+    """
+    current_year = datetime.now().year
+    pairs = [
+        (int(start), current_year if end.lower() == "present" else int(end))
+        for start, end in roles
+    ]
+    return np.array(pairs, dtype=np.int32).reshape(-1, 2)
+
+
 def calculate_total_experience(roles: list[list[str]]) -> int:
     """
     Calculate total experience in years from extracted role date ranges.
     This must NOT be done by the LLM.
     """
-    current_year = datetime.now().year
-    total_years = 0
+    spans = _parse_roles_to_array(roles)
+    return int((spans[:, 1] - spans[:, 0]).sum())
+
+
+def calculate_total_experience_batch(roles_per_candidate: list[list[list[str]]]) -> list[int]:
+    """
+    Total experience for every candidate in one stacked array pass.
+
+    All role spans are concatenated into a single array tagged with
+    their owning candidate index, so the subtraction and per-candidate
+    summation each run once over contiguous memory.
+    """
+    if not roles_per_candidate:
+        return []
+
+    spans = [_parse_roles_to_array(roles) for roles in roles_per_candidate]
+    stacked = np.concatenate(spans)
+    owners = np.repeat(
+        np.arange(len(spans)),
+        [len(s) for s in spans]
+    )
 
-    for start, end in roles:
-        start_year = int(start)
-        end_year = current_year if end.lower() == "present" else int(end)
-        total_years += end_year - start_year
+    durations = stacked[:, 1] - stacked[:, 0]
+    totals = np.bincount(owners, weights=durations, minlength=len(spans))
 
-    return total_years
+    return totals.astype(int).tolist()
@@ -0,0 +1,53 @@
+"""
+Content-addressed disk cache for LLM extraction results.
+
+Re-running the pipeline over an unchanged resume directory is the
+single biggest avoidable cost in this system: every resume would
+re-invoke the LLM for an answer we already have. Each extraction is
+keyed by sha256(input text + model id + prompt template), so editing
+the model or the prompt invalidates exactly the affected entries and
+unchanged inputs cost zero compute.
+
+Entries are stored as one JSON file per key under .llm_cache/ and
+revalidated through the target schema on load, so a corrupt or
+schema-stale entry silently falls through to a fresh LLM call.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Optional, Type, TypeVar
+
+from pydantic import BaseModel
+
+
+CACHE_DIR = Path(__file__).parent / ".llm_cache"
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+
+def cache_key(text: str, model_id: str, prompt_version: str) -> str:
+    """
+    Content address for one extraction: input text, model id and the
+    prompt template all participate, so changing any of them misses.
+    """
+    payload = "\x00".join((text, model_id, prompt_version))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load(key: str, schema: Type[SchemaT]) -> Optional[SchemaT]:
+    """Return the cached result for key, or None on miss/corruption."""
+    path = CACHE_DIR / f"{key}.json"
+    if not path.exists():
+        return None
+
+    try:
+        return schema.model_validate_json(path.read_text(encoding="utf-8"))
+    except Exception:
+        # Corrupt or schema-stale entry: treat as a miss and recompute.
+        return None
+
+
+def store(key: str, result: BaseModel) -> None:
+    CACHE_DIR.mkdir(exist_ok=True)
+    path = CACHE_DIR / f"{key}.json"
+    path.write_text(result.model_dump_json(), encoding="utf-8")
@@ -1,10 +1,16 @@
+import functools
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Dict
 
-from langchain_ollama import ChatOllama
+import numpy as np
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import PydanticOutputParser
 
+import llm_cache
+from parsers import FastJsonParser
+from clients import jd_llm as llm
 from schemas import CandidateProfile
 from pydantic import BaseModel
 
@@ -20,30 +26,89 @@ SKILL_ALIASES = {
     "aws ec2": "aws",
 }
 
+# Single compiled alternation over all alias keys, longest first so
+# "rest apis" wins over its "rest api" prefix. One pass over the
+# string replaces every alias, including aliases embedded in longer
+# skill strings, which the old exact-match dict lookup missed.
+ALIAS_RE = re.compile(
+    r"\b("
+    + "|".join(map(re.escape, sorted(SKILL_ALIASES, key=len, reverse=True)))
+    + r")\b"
+)
+
+
+# Memoized: the same skill strings recur across candidates and across
+# the required/nice-to-have passes, so each is lowercased/aliased once.
+@functools.lru_cache(maxsize=4096)
 def normalize_skill(skill: str) -> str:
-    skill = skill.lower().strip()
-    return SKILL_ALIASES.get(skill, skill)
+    return ALIAS_RE.sub(
+        lambda m: SKILL_ALIASES[m.group(1)],
+        skill.lower().strip()
+    )
+
+
+# 64-bit token fingerprint: one bit per token, bucketed by hash.
+# Two skills sharing a token always share a bit, so a zero AND of the
+# fingerprints proves disjointness without building any sets.
+@functools.lru_cache(maxsize=4096)
+def _skill_bits(skill: str) -> int:
+    bits = 0
+    for token in skill.split():
+        bits |= 1 << (hash(token) & 63)
+    return bits
 
 
 def skill_matches(jd_skill: str, resume_skill: str) -> bool:
+    # Branchless prefilter: most non-matches die on this single AND.
+    if not (_skill_bits(jd_skill) & _skill_bits(resume_skill)):
+        return False
+
+    # Shared bits can be hash collisions; verify with exact tokens.
     jd_tokens = set(jd_skill.split())
     resume_tokens = set(resume_skill.split())
     return len(jd_tokens & resume_tokens) > 0
 
 
 
-def compute_skill_match(jd_skills: list[str], resume_skills: list[str]) -> float:
-    jd_normalized = [normalize_skill(s) for s in jd_skills]
-    resume_normalized = [normalize_skill(s) for s in resume_skills]
+def _build_skill_index(normalized_skills: list[str]) -> dict[str, set[int]]:
+    """
+    Inverted index: token -> indices of skills containing that token.
 
+    Built once per skill list, it turns the all-pairs token comparison
+    in compute_skill_match (O(|jd| * |resume|) set constructions) into
+    a single dict probe per JD token.
+    """
+    index: dict[str, set[int]] = {}
+    for i, skill in enumerate(normalized_skills):
+        for token in skill.split():
+            index.setdefault(token, set()).add(i)
+    return index
+
+
+def _match_against_index(jd_normalized: list[str], index: dict[str, set[int]]) -> float:
     matched = 0
     for jd_skill in jd_normalized:
-        if any(skill_matches(jd_skill, res_skill) for res_skill in resume_normalized):
+        if any(token in index for token in jd_skill.split()):
             matched += 1
 
     return matched / len(jd_normalized) if jd_normalized else 0.0
 
 
+def _compute_skill_match_prenormalized(
+    jd_normalized: list[str],
+    resume_normalized: list[str]
+) -> float:
+    """Variant for callers that have already normalized both sides."""
+    return _match_against_index(jd_normalized, _build_skill_index(resume_normalized))
+
+
+def compute_skill_match(jd_skills: list[str], resume_skills: list[str]) -> float:
+    return _compute_skill_match_prenormalized(
+        [normalize_skill(s) for s in jd_skills],
+        [normalize_skill(s) for s in resume_skills]
+    )
+
+
 
 
 
@@ -59,9 +124,15 @@ class JobRequirements(BaseModel):
 
 # ------------------------------------------------------------------
 # MATCH RESULT SCHEMA
+#
+# Pure internal container, never touched by an LLM: a slotted
+# dataclass skips Pydantic's per-field validation, which is pure
+# overhead when constructing one of these per candidate at scale.
+# Schemas that sit on the LLM boundary stay Pydantic.
 # ------------------------------------------------------------------
 
-class MatchResult(BaseModel):
+@dataclass(slots=True)
+class MatchResult:
     required_skills_match: float
     nice_to_have_match: float
     experience_match: bool
@@ -72,11 +143,12 @@ class MatchResult(BaseModel):
 
 # ------------------------------------------------------------------
 # LLM (ONLY USED FOR JD EXTRACTION)
+#
+# The handle itself lives in clients.py so both agents share one
+# connection-pool configuration.
 # ------------------------------------------------------------------
 
-llm = ChatOllama(model="phi3", temperature=0)
-
-jd_parser = PydanticOutputParser(pydantic_object=JobRequirements)
+jd_parser = FastJsonParser(pydantic_object=JobRequirements)
 
 jd_prompt = ChatPromptTemplate.from_template("""
 You are a data extraction engine.
@@ -112,6 +184,10 @@ Job Description:
 
 jd_chain = jd_prompt | llm | jd_parser
 
+# Part of the JD extraction cache key: prompt edits invalidate
+# entries produced with the old wording.
+_JD_PROMPT_VERSION = jd_prompt.messages[0].prompt.template
+
 
 # ------------------------------------------------------------------
 # AGENT INTERFACE (JOB REQUIREMENTS EXTRACTION)
@@ -123,11 +199,29 @@ def extract_job_requirements(job_text: str):
     - Convert unstructured JD into structured JobRequirements
     - Enforce schema validity
     - No scoring, no business logic
+
+    Served from the content-addressed disk cache when the JD text,
+    model and prompt are all unchanged.
     """
-    return jd_chain.invoke({
+    key = llm_cache.cache_key(job_text, llm.model, _JD_PROMPT_VERSION)
+    cached = llm_cache.load(key, JobRequirements)
+    if cached is not None:
+        return cached
+
+    job = jd_chain.invoke({
         "job_description": job_text
     })
 
+    # Normalize once at production time so downstream matching never
+    # re-lowercases/aliases the same JD strings per candidate.
+    job.required_skills = [normalize_skill(s) for s in job.required_skills]
+    job.nice_to_have_skills = [normalize_skill(s) for s in job.nice_to_have_skills]
+
+    # Cached post-normalization so hits skip that pass too.
+    llm_cache.store(key, job)
+
+    return job
+
 
 # ------------------------------------------------------------------
 # MATCHING LOGIC (PURE PYTHON)
@@ -139,16 +233,22 @@ def compute_match(
     job: JobRequirements
 ) -> MatchResult:
 
+    # One inverted index over the candidate's skills, reused for both
+    # the required and nice-to-have passes (previously built twice).
+    candidate_index = _build_skill_index(
+        [normalize_skill(s) for s in candidate.skills]
+    )
+
     # Required skills (normalized, token-based)
-    required_score = compute_skill_match(
-        job.required_skills,
-        candidate.skills
+    required_score = _match_against_index(
+        [normalize_skill(s) for s in job.required_skills],
+        candidate_index
     )
 
     # Nice-to-have skills (normalized, token-based)
-    nice_score = compute_skill_match(
-        job.nice_to_have_skills,
-        candidate.skills
+    nice_score = _match_against_index(
+        [normalize_skill(s) for s in job.nice_to_have_skills],
+        candidate_index
     )
 
 
@@ -181,6 +281,177 @@ def compute_match(
     )
 
 
+# ------------------------------------------------------------------
+# VECTORIZED BATCH MATCHING (NUMPY)
+#
+# Cross-candidate scoring as matrix ops instead of per-candidate
+# Python loops: every token gets an integer id in a shared vocabulary,
+# each candidate becomes one uint8 row of a token-presence matrix, and
+# each JD skill becomes a token-indicator row. One matmul answers
+# "which candidates hit which JD skills" for the whole batch.
+# ------------------------------------------------------------------
+
+def _token_vocab(skill_lists: list[list[str]]) -> dict[str, int]:
+    """Assign an integer id to every token across the given skill lists."""
+    vocab: dict[str, int] = {}
+    for skills in skill_lists:
+        for skill in skills:
+            for token in skill.split():
+                vocab.setdefault(token, len(vocab))
+    return vocab
+
+
+def _token_matrix(skill_lists: list[list[str]], vocab: dict[str, int]) -> np.ndarray:
+    """One uint8 row per skill list, 1 where the list contains the token."""
+    matrix = np.zeros((len(skill_lists), max(len(vocab), 1)), dtype=np.uint8)
+    for i, skills in enumerate(skill_lists):
+        for skill in skills:
+            for token in skill.split():
+                matrix[i, vocab[token]] = 1
+    return matrix
+
+
+def _score_batch(
+    C: np.ndarray,
+    req_ind: np.ndarray,
+    nice_ind: np.ndarray,
+    experience_years: np.ndarray,
+    minimum_experience_years: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fused scoring kernel over the whole candidate batch.
+
+    Takes the dense token-presence bitmap and the JD indicator rows
+    and produces every score array in one pass: skill-hit matmuls,
+    experience comparison and the weighted final score all stay inside
+    vectorized array ops, with no per-candidate Python in between.
+    """
+    n = C.shape[0]
+
+    def _hit_rates(indicator: np.ndarray) -> np.ndarray:
+        if indicator.shape[0] == 0:
+            return np.zeros(n)
+        # (n x V) @ (V x n_skills) = shared-token counts; >0 is a hit
+        return ((C @ indicator.T.astype(np.int64)) > 0).mean(axis=1)
+
+    required_scores = _hit_rates(req_ind)
+    nice_scores = _hit_rates(nice_ind)
+    experience_ok = experience_years >= minimum_experience_years
+
+    final_scores = (
+        required_scores * 60 +
+        nice_scores * 20 +
+        experience_ok * 20
+    ).astype(int)
+
+    return required_scores, nice_scores, experience_ok, final_scores
+
+
+def compute_match_batch(
+    candidates: list[CandidateProfile],
+    experience_years: list[int],
+    job: JobRequirements
+) -> list[MatchResult]:
+    """
+    Score every candidate against the JD in one vectorized pass.
+
+    Semantics are identical to compute_match: a JD skill counts as
+    matched when any of its tokens appears in any of the candidate's
+    skills. The per-candidate set intersections collapse into a single
+    candidate-matrix x skill-indicator matmul across the whole batch.
+    """
+    req_norm = [normalize_skill(s) for s in job.required_skills]
+    nice_norm = [normalize_skill(s) for s in job.nice_to_have_skills]
+    cand_norm = [[normalize_skill(s) for s in c.skills] for c in candidates]
+
+    vocab = _token_vocab([req_norm, nice_norm] + cand_norm)
+
+    # C: n_candidates x |vocab| token presence
+    C = _token_matrix(cand_norm, vocab)
+    # One indicator row per JD skill (wrapped as single-skill lists)
+    req_ind = _token_matrix([[s] for s in req_norm], vocab)
+    nice_ind = _token_matrix([[s] for s in nice_norm], vocab)
+
+    n = len(candidates)
+
+    required_scores, nice_scores, experience_ok, final_scores = _score_batch(
+        C,
+        req_ind,
+        nice_ind,
+        np.asarray(experience_years),
+        job.minimum_experience_years
+    )
+
+    results = []
+    for i in range(n):
+        decision = "Accept" if final_scores[i] >= 70 else "Reject"
+        reason = (
+            "Strong overall match"
+            if decision == "Accept"
+            else "Meets experience but lacks core backend requirements"
+        )
+        results.append(MatchResult(
+            required_skills_match=round(float(required_scores[i]), 2),
+            nice_to_have_match=round(float(nice_scores[i]), 2),
+            experience_match=bool(experience_ok[i]),
+            final_score=int(final_scores[i]),
+            decision=decision,
+            reason=reason
+        ))
+
+    return results
+
+
+# ------------------------------------------------------------------
+# PARALLEL SCORING (LARGE CANDIDATE POOLS)
+#
+# Scoring is embarrassingly parallel across candidates, but each
+# candidate is cheap, so work is dispatched in chunks to amortize
+# pickling, and only once the pool is large enough for process
+# startup to pay for itself. Below the threshold the single-process
+# vectorized path wins.
+# ------------------------------------------------------------------
+
+PARALLEL_SCORING_THRESHOLD = 200
+SCORING_CHUNK_SIZE = 32
+
+
+def _score_chunk(args: tuple) -> list[MatchResult]:
+    candidates, experience_years, job = args
+    return compute_match_batch(candidates, experience_years, job)
+
+
+def compute_match_parallel(
+    candidates: list[CandidateProfile],
+    experience_years: list[int],
+    job: JobRequirements
+) -> list[MatchResult]:
+    """
+    Score candidates across all cores for large pools.
+
+    Chunks of SCORING_CHUNK_SIZE candidates go to worker processes;
+    pools below PARALLEL_SCORING_THRESHOLD fall back to the serial
+    vectorized path, where process spawn and pickling would cost more
+    than they save.
+    """
+    if len(candidates) < PARALLEL_SCORING_THRESHOLD:
+        return compute_match_batch(candidates, experience_years, job)
+
+    chunks = [
+        (
+            candidates[i:i + SCORING_CHUNK_SIZE],
+            experience_years[i:i + SCORING_CHUNK_SIZE],
+            job
+        )
+        for i in range(0, len(candidates), SCORING_CHUNK_SIZE)
+    ]
+
+    with ProcessPoolExecutor() as executor:
+        scored_chunks = executor.map(_score_chunk, chunks)
+
+    return [result for chunk in scored_chunks for result in chunk]
+
+
 # ------------------------------------------------------------------
 # EXECUTION
 # ------------------------------------------------------------------
@@ -212,4 +483,4 @@ if __name__ == "__main__":
 
     print("\nMATCH RESULT")
     print("=" * 60)
-    print(match_result.model_dump())
+    print(asdict(match_result))
@@ -0,0 +1,73 @@
+"""
+Fast-path JSON parsing for LLM output.
+
+PydanticOutputParser runs regex-based JSON extraction, stdlib
+json.loads and full per-field validation on every LLM response. The
+models here are prompted into a strict schema, so the common case
+only needs: slice out the JSON object, decode it with orjson (a C
+extension, several times faster than stdlib json), shape-check the
+required keys, and build the model with model_construct, skipping
+field coercion entirely. Anything unexpected falls back to the full
+Pydantic parse so malformed output still surfaces a proper error.
+"""
+
+from typing import Generic, Type, TypeVar
+
+import orjson
+from langchain_core.output_parsers import BaseOutputParser, PydanticOutputParser
+from pydantic import BaseModel
+
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+
+def _extract_json(text: str) -> str:
+    """Slice from the first '{' to the last '}' — no regex backtracking."""
+    start = text.find("{")
+    end = text.rfind("}")
+    if start == -1 or end < start:
+        raise ValueError("no JSON object found in LLM output")
+    return text[start:end + 1]
+
+
+class FastJsonParser(BaseOutputParser[SchemaT], Generic[SchemaT]):
+    """
+    orjson decode + model_construct fast path, full Pydantic fallback.
+
+    Drop-in for PydanticOutputParser at the LLM boundary: same format
+    instructions, same parsed type, but the happy path never touches
+    regex extraction or per-field validation.
+    """
+
+    pydantic_object: Type[SchemaT]
+
+    def parse(self, text: str) -> SchemaT:
+        try:
+            data = orjson.loads(_extract_json(text))
+            if not isinstance(data, dict):
+                raise ValueError("LLM output is not a JSON object")
+
+            missing = [
+                name
+                for name, field in self.pydantic_object.model_fields.items()
+                if field.is_required() and name not in data
+            ]
+            if missing:
+                raise ValueError(f"missing required fields: {missing}")
+
+            return self.pydantic_object.model_construct(**data)
+        except Exception:
+            # Slow path: full extraction + validation, and a proper
+            # OutputParserException if the output really is broken.
+            return PydanticOutputParser(
+                pydantic_object=self.pydantic_object
+            ).parse(text)
+
+    def get_format_instructions(self) -> str:
+        return PydanticOutputParser(
+            pydantic_object=self.pydantic_object
+        ).get_format_instructions()
+
+    @property
+    def _type(self) -> str:
+        return "fast_json"
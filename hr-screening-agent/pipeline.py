@@ -7,63 +7,131 @@ Stages:
 3. Decision & Explanation
 
 This file represents the control plane of the agentic system.
+
+The stages run as a streaming pipeline rather than strict phases:
+resume file reads feed a bounded queue, a pool of extraction workers
+drains it against the LLM, and a scoring consumer ranks profiles as
+they arrive. Disk I/O overlaps with model compute, and peak memory is
+O(queue size) instead of O(all resumes). The batch APIs
+(extract_candidate_profiles, compute_match_batch/parallel) remain for
+offline bulk scoring of already-extracted profiles.
 """
 
+import asyncio
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
 from pathlib import Path
 
-from extraction_agent import extract_candidate_profile, calculate_total_experience
-from matching_engine import compute_match, extract_job_requirements
+from clients import warm_up
+from extraction_agent import (
+    OLLAMA_NUM_PARALLEL,
+    calculate_total_experience,
+    extract_candidate_profile,
+)
+from matching_engine import MatchResult, compute_match, extract_job_requirements
 from schemas import CandidateProfile, JobRequirements
 
 
 BASE_DIR = Path(__file__).parent
 
+# Bounded so a fast producer cannot pile every resume into memory
+# while the LLM is still chewing on the first few.
+QUEUE_SIZE = 16
+
 
 def load_job_description() -> str:
     with open(BASE_DIR / "data" / "job_description.txt", "r", encoding="utf-8") as f:
         return f.read()
 
 
+def _read_resume(resume_file: Path) -> str:
+    with open(resume_file, "r", encoding="utf-8") as f:
+        return f.read()
+
+
 def load_resumes() -> list[str]:
     resumes_dir = BASE_DIR / "data" / "resumes"
-    resumes = []
-    for resume_file in sorted(resumes_dir.glob("resume_*.txt")):
-        with open(resume_file, "r", encoding="utf-8") as f:
-            resumes.append(f.read())
-    return resumes
+    resume_files = sorted(resumes_dir.glob("resume_*.txt"))
+
+    # Reads overlap in a thread pool instead of queueing behind one
+    # another; order is preserved by executor.map.
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        return list(executor.map(_read_resume, resume_files))
 
 
-def run_screening_pipeline():
+async def run_screening_pipeline(top_k: int | None = None):
     print("\n[PIPELINE] Starting HR Screening Agent\n")
 
+    # Warm both model slots in parallel before any real work so the
+    # JD call and the first extraction skip the cold start (see
+    # clients.py for the required Ollama env vars).
+    await warm_up()
+
     # -------------------------------
     # Stage 1: Job Understanding
     # -------------------------------
     print("[STAGE 1] Extracting job requirements...")
     job_text = load_job_description()
-    job_requirements: JobRequirements = extract_job_requirements(job_text)
 
-    # -------------------------------
-    # Stage 1: Candidate Extraction
-    # -------------------------------
-    print("[STAGE 1] Extracting candidate profiles...")
-    resumes = load_resumes()
-    candidates: list[CandidateProfile] = []
-
-    for resume_text in resumes:
-        candidate = extract_candidate_profile(resume_text)
-        candidates.append(candidate)
+    # JD extraction is only needed by the scorer, so it runs in the
+    # background while resume reads and extractions already stream.
+    jd_task = asyncio.create_task(
+        asyncio.to_thread(extract_job_requirements, job_text)
+    )
 
     # -------------------------------
-    # Stage 2: Matching & Scoring
+    # Stage 1+2: Streaming Extraction & Scoring
     # -------------------------------
-    print("[STAGE 2] Evaluating candidates...\n")
-
-    results = []
-    for candidate in candidates:
-        experience_years = calculate_total_experience(candidate.roles)
-        match_result = compute_match(candidate, experience_years, job_requirements)
-        results.append((candidate.name, match_result))
+    print("[STAGE 1] Extracting candidate profiles...")
+    print("[STAGE 2] Evaluating candidates as they arrive...\n")
+
+    in_q: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    out_q: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    n_extractors = OLLAMA_NUM_PARALLEL
+
+    # Min-heap of (score, arrival order, name, result): with a top_k
+    # it holds at most K entries, so ranking memory is O(K).
+    ranked_heap: list[tuple[int, int, str, MatchResult]] = []
+
+    async def producer():
+        resumes_dir = BASE_DIR / "data" / "resumes"
+        for resume_file in sorted(resumes_dir.glob("resume_*.txt")):
+            await in_q.put(await asyncio.to_thread(_read_resume, resume_file))
+        for _ in range(n_extractors):
+            await in_q.put(None)
+
+    async def extractor():
+        while (resume_text := await in_q.get()) is not None:
+            await out_q.put(await extract_candidate_profile(resume_text))
+        await out_q.put(None)
+
+    async def scorer():
+        job_requirements: JobRequirements = await jd_task
+
+        finished_extractors = 0
+        arrival = 0
+        while finished_extractors < n_extractors:
+            candidate: CandidateProfile = await out_q.get()
+            if candidate is None:
+                finished_extractors += 1
+                continue
+
+            experience_years = calculate_total_experience(candidate.roles)
+            result = compute_match(candidate, experience_years, job_requirements)
+
+            entry = (result.final_score, arrival, candidate.name, result)
+            arrival += 1
+            if top_k is None or len(ranked_heap) < top_k:
+                heapq.heappush(ranked_heap, entry)
+            elif entry[0] > ranked_heap[0][0]:
+                heapq.heapreplace(ranked_heap, entry)
+
+    await asyncio.gather(
+        producer(),
+        *[extractor() for _ in range(n_extractors)],
+        scorer(),
+    )
 
     # -------------------------------
     # Decision & Explanation
@@ -71,12 +139,12 @@ def run_screening_pipeline():
     print("\nFINAL RANKED RESULTS")
     print("=" * 60)
 
-    ranked = sorted(results, key=lambda x: x[1].final_score, reverse=True)
+    ranked = sorted(ranked_heap, key=lambda e: e[0], reverse=True)
 
-    for rank, (name, result) in enumerate(ranked, start=1):
+    for rank, (_, _, name, result) in enumerate(ranked, start=1):
         print(f"\nRank {rank}: {name}")
-        print(result.model_dump())
+        print(asdict(result))
 
 
 if __name__ == "__main__":
-    run_screening_pipeline()
+    asyncio.run(run_screening_pipeline())